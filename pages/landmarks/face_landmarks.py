@@ -14,4 +14,6 @@ st_ss = st.session_state
 def main():
     utils.show_source_code("src/computer_vision/landmarks/face_landmarks.py")
 
-    st_ss.setdefault("face_app", FaceLandmarkerApp()).stream()
+    if "face_app" not in st_ss:
+        st_ss.face_app = FaceLandmarkerApp()
+    st_ss.face_app.stream()
@@ -14,4 +14,6 @@ st_ss = st.session_state
 def main():
     utils.show_source_code("src/computer_vision/landmarks/pose_landmarks.py")
 
-    st_ss.setdefault("pose_app", PoseLandmarkerApp()).stream()
+    if "pose_app" not in st_ss:
+        st_ss.pose_app = PoseLandmarkerApp()
+    st_ss.pose_app.stream()
@@ -22,22 +22,27 @@ def main():
         placeholder="Choose an option",
         options=LLM_CONFIG.keys(),
         index=0,
-        on_change=utils.reset_session_state_key,
-        kwargs={"key": "chatbot_web_summary"},
     )
 
     chosen_chain_type = st.selectbox(
         label="Chain type:",
         options=ChatbotWebSummary.available_chain_types,
         index=None,
-        on_change=utils.reset_session_state_key,
-        kwargs={"key": "chatbot_web_summary"},
     )
 
     if chosen_model and chosen_chain_type:
-        chatbot = st_ss.setdefault(
-            "chatbot_web_summary", ChatbotWebSummary(**LLM_CONFIG[chosen_model])
-        )
+        selection = (chosen_model, chosen_chain_type)
+        if (
+            "chatbot_web_summary" not in st_ss
+            or st_ss.get("chatbot_web_summary_selection") != selection
+        ):
+            if "chatbot_web_summary" in st_ss:
+                st_ss.chatbot_web_summary.close()
+            st_ss.chatbot_web_summary = ChatbotWebSummary(
+                chain_type=chosen_chain_type, **LLM_CONFIG[chosen_model]
+            )
+            st_ss.chatbot_web_summary_selection = selection
+        chatbot = st_ss.chatbot_web_summary
     else:
         st.info("Choose a chain type for the LLM", icon="ℹ️")
 
@@ -48,6 +53,6 @@ def main():
         if validators.url(input_url):
             st.chat_message("human").write(input_url)
             with st.chat_message("ai"):
-                chatbot.summarize(url=input_url)
+                chatbot.run_coroutine(chatbot.summarize(url=input_url))
         else:
             st.error("Invalid URL", icon="❌")
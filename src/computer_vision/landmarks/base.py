@@ -1,6 +1,8 @@
+import operator
 import os
+import queue
+import threading
 import typing as t
-from datetime import datetime
 
 import cv2
 import mediapipe as mp
@@ -10,6 +12,7 @@ from mediapipe.framework.formats import landmark_pb2
 from numpy import ndarray
 
 import utils
+from src.computer_vision.landmarks import drawing
 
 logger = utils.CustomLogger(__file__)
 
@@ -17,30 +20,152 @@ os.environ["MEDIAPIPE_DISABLE_GPU"] = "1"
 
 
 class BaseLandmarkerApp:
+    __slots__ = (
+        "landmarker",
+        "connections_list",
+        "drawing_specs_list",
+        "connection_groups_list",
+        "landmarks_getter",
+        "raw_queue",
+        "result_lock",
+        "last_landmark_list",
+        "worker",
+        "worker_lock",
+        "worker_stop",
+        "last_thumbnail_hash",
+    )
+
+    detection_width = 640
+
     def __init__(self):
-        pass
+        self.landmarker = self.build_landmarker()
+        self.connections_list = self.build_connections_list()
+        self.drawing_specs_list = self.build_drawing_specs_list()
+        self.connection_groups_list = self.build_connection_groups_list()
+        drawing.warm_up()
+        self.raw_queue: queue.Queue[ndarray] = queue.Queue(maxsize=1)
+        self.result_lock = threading.Lock()
+        self.last_landmark_list: landmark_pb2.NormalizedLandmarkList | None = None
+        self.worker: threading.Thread | None = None
+        self.worker_lock = threading.Lock()
+        self.worker_stop = threading.Event()
+        self.last_thumbnail_hash: int | None = None
+        self.landmarks_getter = operator.attrgetter(self.landmarks_type)
+
+    def build_connection_groups_list(
+        self,
+    ) -> t.List[t.List[drawing.ConnectionGroup]]:
+        return [
+            drawing.group_connections(
+                connections=connections,
+                connection_drawing_spec=drawing_specs.get(
+                    "connection_drawing_spec", drawing.DEFAULT_CONNECTION_SPEC
+                ),
+            )
+            for connections, drawing_specs in zip(
+                self.connections_list, self.drawing_specs_list
+            )
+        ]
+
+    def to_detection_input(self, image: ndarray) -> ndarray:
+        # landmarks are normalized, so detecting on a smaller copy changes nothing downstream
+        width = image.shape[1]
+        if width > self.detection_width:
+            scale = self.detection_width / width
+            image = cv2.resize(
+                image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+            )
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
 
     def get_landmarks(self, image: ndarray) -> landmark_pb2.NormalizedLandmarkList:
         detection_result = self.landmarker.process(image)
-        landmark_list = getattr(detection_result, self.landmarks_type)
+        landmark_list = self.landmarks_getter(detection_result)
         return landmark_list[0] if isinstance(landmark_list, list) else landmark_list
 
+    @staticmethod
+    def put_latest(q: queue.Queue, item: t.Any) -> None:
+        # drop the oldest item rather than blocking, to keep latency low
+        while True:
+            try:
+                q.put(item, block=False)
+                return
+            except queue.Full:
+                try:
+                    q.get(block=False)
+                except queue.Empty:
+                    pass
+
+    def detect_worker(self, stop: threading.Event) -> None:
+        # polling with a timeout lets the thread, and the graph it references, go away
+        while not stop.is_set():
+            try:
+                image = self.raw_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            # a stalled camera repeats frames, whose landmarks are already known
+            thumbnail = cv2.resize(image, (32, 32), interpolation=cv2.INTER_AREA)
+            thumbnail_hash = hash(thumbnail.tobytes())
+            if thumbnail_hash == self.last_thumbnail_hash:
+                continue
+            self.last_thumbnail_hash = thumbnail_hash
+
+            try:
+                landmark_list = self.get_landmarks(image)
+            except Exception:
+                # keep the worker alive, and stop drawing landmarks that are now stale
+                logger.logger.exception("Landmark detection failed")
+                landmark_list = None
+            with self.result_lock:
+                if not stop.is_set():
+                    self.last_landmark_list = landmark_list
+
+    def start_worker(self) -> None:
+        with self.worker_lock:
+            if self.worker is not None:
+                return
+
+            self.worker_stop = threading.Event()
+            self.worker = threading.Thread(
+                target=self.detect_worker, args=(self.worker_stop,), daemon=True
+            )
+            self.worker.start()
+
+    def stop_worker(self) -> None:
+        with self.worker_lock:
+            self.worker_stop.set()
+            self.worker = None
+        # the next stream must not be annotated with this one's landmarks
+        with self.result_lock:
+            self.last_landmark_list = None
+        self.last_thumbnail_hash = None
+        try:
+            self.raw_queue.get(block=False)
+        except queue.Empty:
+            pass
+
     def video_frame_callback(self, frame: VideoFrame) -> VideoFrame:
+        self.start_worker()
         image = frame.to_ndarray(format="bgr24")
+        # detection runs in the background, frames are annotated with the latest result
+        self.put_latest(self.raw_queue, self.to_detection_input(image))
+        with self.result_lock:
+            landmark_list = self.last_landmark_list
 
-        landmark_list = self.get_landmarks(image)
-        self.annotate_landmarks(
-            image=image,
-            connections_list=self.connections_list,
-            landmark_list=landmark_list,
-            drawing_specs_list=self.drawing_specs_list,
-        )
+        if landmark_list:
+            self.annotate_landmarks(
+                image=image,
+                connection_groups_list=self.connection_groups_list,
+                landmark_list=landmark_list,
+                drawing_specs_list=self.drawing_specs_list,
+            )
         utils.annotate_time(image=image)
         return VideoFrame.from_ndarray(image, format="bgr24")
 
     def stream(self) -> None:
         st_webrtc.webrtc_streamer(
             video_frame_callback=self.video_frame_callback,
+            on_video_ended=self.stop_worker,
             key=f"{self.landmarks_type}_streamer",
             mode=st_webrtc.WebRtcMode.SENDRECV,
             rtc_configuration=st_webrtc.RTCConfiguration(
@@ -51,53 +176,31 @@ class BaseLandmarkerApp:
             desired_playing_state=None,
         )
 
-    @staticmethod
-    def annotate_time(image: ndarray) -> None:
-        text = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        text_args = {
-            "text": text,
-            "fontFace": cv2.FONT_HERSHEY_SIMPLEX,
-            "fontScale": 1,
-            "thickness": 2,
-        }
-        text_size = cv2.getTextSize(**text_args)[0]
-        rect_width, rect_height = text_size[0] + 20, text_size[1] + 20
-        cv2.rectangle(
-            img=image,
-            pt1=(0, 0),
-            pt2=(rect_width, rect_height),
-            color=(255, 255, 255),
-            thickness=cv2.FILLED,
-        )
-        cv2.rectangle(
-            img=image,
-            pt1=(0, 0),
-            pt2=(rect_width, rect_height),
-            color=(0, 0, 0),
-            thickness=2,
-        )
-        cv2.putText(
-            img=image,
-            org=(10, text_size[1] + 10),
-            color=(0, 0, 0),
-            lineType=cv2.LINE_AA,
-            **text_args,
-        )
-
     @staticmethod
     def annotate_landmarks(
         image: ndarray,
-        connections_list: t.List[t.FrozenSet[t.Tuple[int, int]]],
+        connection_groups_list: t.List[t.List[drawing.ConnectionGroup]],
         landmark_list: landmark_pb2.NormalizedLandmarkList,
         drawing_specs_list: t.List[t.Dict[str, mp.solutions.drawing_utils.DrawingSpec]],
     ) -> None:
-        if not landmark_list:
-            return
-
-        for connections, drawing_specs in zip(connections_list, drawing_specs_list):
-            mp.solutions.drawing_utils.draw_landmarks(
+        height, width, _ = image.shape
+        pixels, visible = drawing.landmarks_to_pixels(
+            landmark_list=landmark_list, width=width, height=height
+        )
+        for connection_groups, drawing_specs in zip(
+            connection_groups_list, drawing_specs_list
+        ):
+            drawing.draw_connections(
                 image=image,
-                landmark_list=landmark_list,
-                connections=connections,
-                **drawing_specs,
+                pixels=pixels,
+                visible=visible,
+                connection_groups=connection_groups,
+            )
+            drawing.draw_landmark_points(
+                image=image,
+                pixels=pixels,
+                visible=visible,
+                landmark_drawing_spec=drawing_specs.get(
+                    "landmark_drawing_spec", drawing.DEFAULT_LANDMARK_SPEC
+                ),
             )
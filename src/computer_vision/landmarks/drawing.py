@@ -0,0 +1,141 @@
+import typing as t
+from collections import defaultdict
+
+import cv2
+import mediapipe as mp
+import numba
+import numpy as np
+from mediapipe.framework.formats import landmark_pb2
+from numpy import ndarray
+
+DrawingSpec = mp.solutions.drawing_utils.DrawingSpec
+ConnectionGroup = t.Tuple[ndarray, DrawingSpec]
+
+DEFAULT_LANDMARK_SPEC = DrawingSpec(color=mp.solutions.drawing_utils.RED_COLOR)
+DEFAULT_CONNECTION_SPEC = DrawingSpec()
+VISIBILITY_THRESHOLD = 0.5
+PRESENCE_THRESHOLD = 0.5
+
+
+def connections_to_array(connections: t.FrozenSet[t.Tuple[int, int]]) -> ndarray:
+    return np.fromiter(
+        (idx for connection in connections for idx in connection),
+        dtype=np.int32,
+        count=2 * len(connections),
+    ).reshape(-1, 2)
+
+
+def group_connections(
+    connections: ndarray,
+    connection_drawing_spec: DrawingSpec | t.Mapping[t.Tuple[int, int], DrawingSpec],
+) -> t.List[ConnectionGroup]:
+    if not isinstance(connection_drawing_spec, t.Mapping):
+        return [(connections, connection_drawing_spec)]
+
+    # one group per distinct style, so that each style is a single cv2 call
+    groups = defaultdict(list)
+    specs = {}
+    for start, end in connections.tolist():
+        spec = connection_drawing_spec[start, end]
+        key = (spec.color, spec.thickness)
+        groups[key].append((start, end))
+        specs[key] = spec
+    return [(np.array(groups[key], dtype=np.int32), specs[key]) for key in groups]
+
+
+@numba.njit(cache=True, fastmath=True)
+def normalized_to_pixels(
+    coords: ndarray,
+    width: int,
+    height: int,
+    pixels: ndarray,
+    visible: ndarray,
+) -> None:
+    for i in range(coords.shape[0]):
+        x, y = coords[i, 0], coords[i, 1]
+        if x < 0 or x > 1 or y < 0 or y > 1:
+            visible[i] = False
+        pixels[i, 0] = min(int(x * width), width - 1)
+        pixels[i, 1] = min(int(y * height), height - 1)
+
+
+def warm_up() -> None:
+    # compile with the argument types used per frame, so the first frame does not stall
+    normalized_to_pixels(
+        np.zeros((1, 2), dtype=np.float32),
+        1,
+        1,
+        np.empty((1, 2), dtype=np.int32),
+        np.ones(1, dtype=np.bool_),
+    )
+
+
+def landmarks_to_pixels(
+    landmark_list: landmark_pb2.NormalizedLandmarkList,
+    width: int,
+    height: int,
+) -> t.Tuple[ndarray, ndarray]:
+    landmarks = landmark_list.landmark
+    coords = np.array([(lm.x, lm.y) for lm in landmarks], dtype=np.float32)
+    visible = np.array(
+        [
+            not (lm.HasField("visibility") and lm.visibility < VISIBILITY_THRESHOLD)
+            and not (lm.HasField("presence") and lm.presence < PRESENCE_THRESHOLD)
+            for lm in landmarks
+        ],
+        dtype=np.bool_,
+    )
+    pixels = np.empty((len(coords), 2), dtype=np.int32)
+    normalized_to_pixels(coords, width, height, pixels, visible)
+    return pixels, visible
+
+
+def draw_connections(
+    image: ndarray,
+    pixels: ndarray,
+    visible: ndarray,
+    connection_groups: t.List[ConnectionGroup],
+) -> None:
+    for connections, spec in connection_groups:
+        segments = pixels[connections[visible[connections].all(axis=1)]]
+        if not len(segments):
+            continue
+        cv2.polylines(
+            img=image,
+            pts=segments,
+            isClosed=False,
+            color=spec.color,
+            thickness=spec.thickness,
+        )
+
+
+def draw_landmark_points(
+    image: ndarray,
+    pixels: ndarray,
+    visible: ndarray,
+    landmark_drawing_spec: DrawingSpec | t.Mapping[int, DrawingSpec] | None,
+) -> None:
+    if not landmark_drawing_spec:
+        return
+
+    for idx in np.flatnonzero(visible).tolist():
+        spec = (
+            landmark_drawing_spec[idx]
+            if isinstance(landmark_drawing_spec, t.Mapping)
+            else landmark_drawing_spec
+        )
+        center = tuple(pixels[idx].tolist())
+        cv2.circle(
+            img=image,
+            center=center,
+            radius=max(spec.circle_radius + 1, int(spec.circle_radius * 1.2)),
+            color=mp.solutions.drawing_utils.WHITE_COLOR,
+            thickness=spec.thickness,
+        )
+        cv2.circle(
+            img=image,
+            center=center,
+            radius=spec.circle_radius,
+            color=spec.color,
+            thickness=spec.thickness,
+        )
@@ -1,19 +1,20 @@
 import typing as t
-from functools import cached_property
 
 import mediapipe as mp
+from numpy import ndarray
 
-from src.computer_vision.landmarks import BaseLandmarkerApp
+from src.computer_vision.landmarks import BaseLandmarkerApp, drawing
 
 
 class FaceLandmarkerApp(BaseLandmarkerApp):
+    __slots__ = ()
+
     landmarks_type = "multi_face_landmarks"
 
     def __init__(self):
         super().__init__()
 
-    @cached_property
-    def landmarker(self) -> mp.solutions.face_mesh.FaceMesh:
+    def build_landmarker(self) -> mp.solutions.face_mesh.FaceMesh:
         return mp.solutions.face_mesh.FaceMesh(
             static_image_mode=False,
             max_num_faces=1,
@@ -22,16 +23,17 @@ class FaceLandmarkerApp(BaseLandmarkerApp):
             min_tracking_confidence=0.5,
         )
 
-    @cached_property
-    def connections_list(self) -> t.List[t.FrozenSet[t.Tuple[int, int]]]:
+    def build_connections_list(self) -> t.List[ndarray]:
         return [
-            mp.solutions.face_mesh.FACEMESH_TESSELATION,
-            mp.solutions.face_mesh.FACEMESH_CONTOURS,
-            mp.solutions.face_mesh.FACEMESH_IRISES,
+            drawing.connections_to_array(connections)
+            for connections in (
+                mp.solutions.face_mesh.FACEMESH_TESSELATION,
+                mp.solutions.face_mesh.FACEMESH_CONTOURS,
+                mp.solutions.face_mesh.FACEMESH_IRISES,
+            )
         ]
 
-    @cached_property
-    def drawing_specs_list(
+    def build_drawing_specs_list(
         self,
     ) -> t.List[t.Dict[str, mp.solutions.drawing_utils.DrawingSpec]]:
         return [
@@ -1,19 +1,20 @@
 import typing as t
-from functools import cached_property
 
 import mediapipe as mp
+from numpy import ndarray
 
-from src.computer_vision.landmarks import BaseLandmarkerApp
+from src.computer_vision.landmarks import BaseLandmarkerApp, drawing
 
 
 class PoseLandmarkerApp(BaseLandmarkerApp):
+    __slots__ = ()
+
     landmarks_type = "pose_landmarks"
 
     def __init__(self):
         super().__init__()
 
-    @cached_property
-    def landmarker(self) -> mp.solutions.pose.Pose:
+    def build_landmarker(self) -> mp.solutions.pose.Pose:
         return mp.solutions.pose.Pose(
             static_image_mode=False,
             model_complexity=1,
@@ -23,12 +24,10 @@ class PoseLandmarkerApp(BaseLandmarkerApp):
             min_tracking_confidence=0.5,
         )
 
-    @cached_property
-    def connections_list(self) -> t.List[t.FrozenSet[t.Tuple[int, int]]]:
-        return [mp.solutions.pose.POSE_CONNECTIONS]
+    def build_connections_list(self) -> t.List[ndarray]:
+        return [drawing.connections_to_array(mp.solutions.pose.POSE_CONNECTIONS)]
 
-    @cached_property
-    def drawing_specs_list(
+    def build_drawing_specs_list(
         self,
     ) -> t.List[t.Dict[str, mp.solutions.drawing_utils.DrawingSpec]]:
         return [
@@ -1,24 +1,33 @@
+import typing as t
+from uuid import UUID
+
 import streamlit as st
 from langchain.callbacks.base import BaseCallbackHandler
+from streamlit.delta_generator import DeltaGenerator
 
 
 class StreamingChatCallbackHandler(BaseCallbackHandler):
+    # async chains must call back on the script thread, where st.* works
+    run_inline = True
+
     def __init__(self):
-        pass
+        self.containers: t.Dict[UUID, DeltaGenerator] = {}
+        self.texts: t.Dict[UUID, str] = {}
 
-    def on_llm_start(self, *args, **kwargs):
-        self.container = st.empty()
-        self.text = ""
+    def on_llm_start(self, *args, run_id: UUID, **kwargs):
+        self.containers[run_id] = st.empty()
+        self.texts[run_id] = ""
 
-    def on_llm_new_token(self, token: str, *args, **kwargs):
-        self.text += token
-        self.container.markdown(
-            body=self.text,
+    def on_llm_new_token(self, token: str, *args, run_id: UUID, **kwargs):
+        self.texts[run_id] += token
+        self.containers[run_id].markdown(
+            body=self.texts[run_id],
             unsafe_allow_html=False,
         )
 
-    def on_llm_end(self, response: str, *args, **kwargs):
-        self.container.markdown(
+    def on_llm_end(self, response: str, *args, run_id: UUID, **kwargs):
+        self.texts.pop(run_id)
+        self.containers.pop(run_id).markdown(
             body=response.generations[0][0].text,
             unsafe_allow_html=False,
         )
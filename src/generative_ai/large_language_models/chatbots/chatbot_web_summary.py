@@ -1,3 +1,5 @@
+import asyncio
+import re
 import typing as t
 from functools import cached_property
 
@@ -5,11 +7,16 @@ from langchain.chains.combine_documents.base import BaseCombineDocumentsChain
 from langchain.chains.summarize import load_summarize_chain
 from langchain.docstore.document import Document
 from langchain.document_loaders import UnstructuredURLLoader
-from unstructured.cleaners.core import (clean, clean_extra_whitespace,
-                                        remove_punctuation)
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 
 from src.generative_ai.large_language_models.chatbots import Chatbot, ModelArgs
 
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def clean_text(text: str) -> str:
+    return WHITESPACE_PATTERN.sub(" ", text).strip()
+
 
 class ChatbotWebSummary(Chatbot):
     available_chain_types = ["stuff", "map_reduce"]
@@ -27,27 +34,83 @@ class ChatbotWebSummary(Chatbot):
         url_loader = UnstructuredURLLoader(
             urls=[source_url],
             mode="elements",
-            post_processors=[clean, remove_punctuation, clean_extra_whitespace],
+            post_processors=[clean_text],
         )
 
-        narrative_elements = [
-            element
+        cleaned_content = " ".join(
+            element.page_content
             for element in url_loader.load()
             if element.metadata.get("category") == "NarrativeText"
-        ]
-        cleaned_content = " ".join(
-            element.page_content for element in narrative_elements
         )
 
         return Document(page_content=cleaned_content, metadata={"source": source_url})
 
+    @classmethod
+    async def urls_to_docs(cls, source_urls: t.List[str]) -> t.List[Document]:
+        loop = asyncio.get_running_loop()
+        return list(
+            await asyncio.gather(
+                *(
+                    loop.run_in_executor(None, cls.url_to_doc, source_url)
+                    for source_url in source_urls
+                )
+            )
+        )
+
     @cached_property
     def chain(self) -> BaseCombineDocumentsChain:
         return load_summarize_chain(self.llm, chain_type=self.chain_type, verbose=True)
 
-    def summarize(self, url: str) -> str:
+    @cached_property
+    def event_loop(self) -> asyncio.AbstractEventLoop:
+        # the async LLM client keeps its connections bound to the loop it first ran on
+        return asyncio.new_event_loop()
+
+    def cancel_pending_tasks(self) -> None:
+        pending = asyncio.all_tasks(self.event_loop)
+        for task in pending:
+            task.cancel()
+        if pending:
+            self.event_loop.run_until_complete(
+                asyncio.gather(*pending, return_exceptions=True)
+            )
+
+    def run_coroutine(self, coroutine: t.Coroutine[t.Any, t.Any, str]) -> str:
+        # an interrupted run must not leave tasks to resume during the next one
+        try:
+            return self.event_loop.run_until_complete(coroutine)
+        finally:
+            self.cancel_pending_tasks()
+
+    def close(self) -> None:
+        if "event_loop" in self.__dict__:
+            self.cancel_pending_tasks()
+            self.event_loop.close()
+
+    @cached_property
+    def splitter(self) -> RecursiveCharacterTextSplitter:
+        return RecursiveCharacterTextSplitter(
+            chunk_size=4000,
+            chunk_overlap=200,
+            length_function=len,
+        )
+
+    def split_docs(self, documents: t.List[Document]) -> t.List[Document]:
+        # map_reduce summarizes each chunk concurrently, stuff needs a single prompt
+        if self.chain_type == "map_reduce":
+            return self.splitter.split_documents(documents)
+        return documents
+
+    async def summarize(self, url: str) -> str:
         document = self.url_to_doc(url)
-        return self.chain.run(
-            [document],
+        return await self.chain.arun(
+            self.split_docs([document]),
+            callbacks=self.callbacks,
+        )
+
+    async def summarize_many(self, urls: t.List[str]) -> str:
+        documents = await self.urls_to_docs(urls)
+        return await self.chain.arun(
+            self.split_docs(documents),
             callbacks=self.callbacks,
         )